@@ -2,6 +2,7 @@
 # /var/www/instavido/adminpanel/blacklist_admin.py
 
 import os, json, re, time, traceback
+import json_io
 from flask import Blueprint, render_template, request, jsonify, current_app, session as flask_session
 
 # ŞABLON YOLU:
@@ -22,8 +23,7 @@ BLACKLIST_FILE = os.path.join(DATA_DIR, "blacklist.json")
 def _ensure_store():
     os.makedirs(DATA_DIR, exist_ok=True)
     if not os.path.exists(BLACKLIST_FILE):
-        with open(BLACKLIST_FILE, "w", encoding="utf-8") as f:
-            json.dump({"profiles": [], "links": []}, f, ensure_ascii=False, indent=2)
+        json_io.write_json(BLACKLIST_FILE, {"profiles": [], "links": []})
 
 def _load():
     _ensure_store()
@@ -35,15 +35,13 @@ def _load():
         try:
             return {"profiles": [], "links": []}
         finally:
-            with open(BLACKLIST_FILE, "w", encoding="utf-8") as f:
-                json.dump({"profiles": [], "links": []}, f, ensure_ascii=False, indent=2)
+            json_io.write_json(BLACKLIST_FILE, {"profiles": [], "links": []})
 
 def _save(payload: dict):
     payload = payload or {"profiles": [], "links": []}
     payload.setdefault("profiles", [])
     payload.setdefault("links", [])
-    with open(BLACKLIST_FILE, "w", encoding="utf-8") as f:
-        json.dump(payload, f, ensure_ascii=False, indent=2)
+    json_io.write_json(BLACKLIST_FILE, payload)
 
 def _norm(s: str) -> str:
     return re.sub(r"\s+", " ", (s or "").strip().lower())
@@ -126,7 +124,7 @@ def add():
             if v.startswith("@"): v = v[1:]
             if not v:
                 return jsonify({"ok": False, "msg": "Geçersiz kullanıcı adı"}), 400
-            if v not in [ _norm(x) for x in payload.get("profiles", []) ]:
+            if not any(_norm(x) == v for x in payload.get("profiles", [])):
                 payload["profiles"].append(v)
             _save(payload)
             return jsonify({"ok": True, "added": v})
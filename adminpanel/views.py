@@ -2,9 +2,12 @@ import os
 import json
 import time
 import random
+import secrets
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import requests
+import json_io
 
 from flask import render_template, request, redirect, url_for, session as login_session, jsonify
 from adminpanel import admin_bp
@@ -21,6 +24,9 @@ BLOCKED_COOKIES_FILE = os.path.join(os.path.dirname(__file__), "../blocked_cooki
 NOTIF_LOG = os.path.join(os.path.dirname(__file__), "../data/notif_log.json")
 SESSION_USE_LOG = os.path.join(os.path.dirname(__file__), "../data/session_use_log.json")
 
+# test_all: aynı anda test edilecek en fazla session sayısı
+TEST_ALL_WORKERS = 8
+
 ADMIN_USERNAME = "srdr"
 ADMIN_PASSWORD = "gizlisifre"
 
@@ -34,14 +40,10 @@ def login_required(f):
     return decorated_function
 
 def load_json(path):
-    if not os.path.exists(path):
-        return []
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return json_io.read_json(path, default=[])
 
 def save_json(path, data):
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    json_io.write_json(path, data)
 
 def get_blocked_sessions():
     """Bloklu sessionid'leri set olarak döner (süresi dolmamış olanlar)."""
@@ -59,11 +61,18 @@ def get_blocked_sessions():
                 pass
     return blocked_ids
 
-def generate_unique_session_key(all_sessions):
-    """Eşsiz 8 haneli session_key üretir."""
+def generate_unique_session_key(all_sessions, existing=None):
+    """
+    Eşsiz 8 haneli (sayısal) session_key üretir.
+    existing: mevcut anahtarların set'i; verilirse yeni anahtar da eklenir
+    (döngü içinde art arda üretimde listeyi her seferinde taramamak için).
+    """
+    if existing is None:
+        existing = {str(sess.get("session_key")) for sess in all_sessions}
     while True:
-        new_key = ''.join(random.choices('0123456789', k=8))
-        if not any(str(sess.get("session_key")) == new_key for sess in all_sessions):
+        new_key = f"{secrets.randbelow(10**8):08d}"
+        if new_key not in existing:
+            existing.add(new_key)
             return new_key
 
 # ---------------- Cookie parsers + fingerprint presets ----------------
@@ -168,10 +177,11 @@ def sessions():
     blocked = get_blocked_sessions()
     # Eksik session_key'leri tamamla + blok bayrağı
     changed = False
+    keys = {str(sess.get("session_key")) for sess in session_list}
     for sess in session_list:
         sess['blocked'] = sess.get('sessionid') in blocked
         if not sess.get('session_key'):
-            sess['session_key'] = generate_unique_session_key(session_list)
+            sess['session_key'] = generate_unique_session_key(session_list, keys)
             changed = True
     if changed:
         save_json(SESSIONS_FILE, session_list)
@@ -393,6 +403,14 @@ def _test_cookie_entry(sess: dict) -> dict:
     return {"ok": False, "status": "invalid", "http": code, "error": "unknown",
             "session_key": sk, "user": user}
 
+def _test_key(sess: dict):
+    """test_all tekilleştirme anahtarı: birleşik cookie'ler + proxy (sessionid yoksa satırın kendisi)."""
+    ck = _merge_cookies(sess)
+    if not ck.get("sessionid"):
+        return id(sess)
+    return (tuple(sorted((str(k), str(v)) for k, v in ck.items())),
+            (sess.get("proxy") or "").strip())
+
 @admin_bp.route('/api/session/test/<session_key>')
 @login_required
 def api_session_test(session_key):
@@ -416,14 +434,28 @@ def api_session_test(session_key):
 @login_required
 def api_session_test_all():
     """
-    Tüm session'ları sırayla test eder, özet döner.
+    Tüm session'ları paralel test eder (her hesap tek istek), özet döner.
     """
     all_sessions = load_json(SESSIONS_FILE)
     summary = {"active": 0, "blocked": 0, "invalid": 0, "total": len(all_sessions)}
     results = []
 
-    for s in all_sessions:
-        res = _test_cookie_entry(s)
+    # aynı cookie seti + proxy birden fazla kayıtta varsa IG'ye yalnızca bir kez sorulur
+    # (sonuç tüm birleşik cookie'lere ve proxy'ye bağlı; yalnız sessionid yetmez)
+    keys = [_test_key(s) for s in all_sessions]
+    unique = {}
+    for k, s in zip(keys, all_sessions):
+        unique.setdefault(k, s)
+
+    # testler birbirinden bağımsız ve ağ bekliyor → paralel çalıştır
+    workers = max(1, min(TEST_ALL_WORKERS, len(unique)))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        tested = dict(zip(unique, ex.map(_test_cookie_entry, unique.values())))
+
+    for k, s in zip(keys, all_sessions):
+        res = tested[k]
+        if unique[k] is not s:
+            res = {**res, "session_key": str(s.get("session_key", "")), "user": s.get("user", "")}
         results.append(res)
         st = res.get("status")
         if st in summary:
@@ -4,8 +4,10 @@ from adminpanel.views import admin_bp
 import adminpanel  # admin_bp ve tüm admin route'larını yükler (views, ads_views)
 import hmac, hashlib, base64, os, re, json, time, io, logging, requests
 from urllib.parse import urlparse, urljoin, quote, urlencode
-import socket, ipaddress
+from email.utils import parsedate_to_datetime
+import socket, ipaddress, threading
 from typing import Optional, Dict, Any, Tuple, List
+from http_client import make_http_session
 from session_logger import log_session_use, notify_download, update_session_counters
 from flask import (
     Flask, render_template, request, redirect,
@@ -19,6 +21,7 @@ from flask_limiter.util import get_remote_address
 from config.redis_helpers import get_redis_client
 import random
 from datetime import datetime
+import json_io
 
 # --- ENTEGRE --- #
 from session_logger import log_session_use, notify_download
@@ -134,31 +137,42 @@ soft_limiter = SimpleLimiter(window_seconds=60, max_requests=60, burst=80)
 BLACKLIST_PATH = "/var/www/instavido/adminpanel/data/blacklist.json"
 
 def _load_blacklist():
-    if not os.path.exists(BLACKLIST_PATH):
-        return {"profiles": [], "links": []}
     try:
-        with open(BLACKLIST_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+        bl = _read_json_cached(BLACKLIST_PATH)
     except Exception:
+        bl = None
+    if bl is None:
         return {"profiles": [], "links": []}
+    return bl
+
+_WS_RE = re.compile(r"\s+")
 
 def _norm(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip().lower())
+    return _WS_RE.sub(" ", (s or "").strip().lower())
+
+# (kaynak blacklist nesnesi, normalize edilmiş profiles+links seti)
+_blacklist_norm_cache: Tuple[Any, frozenset] = (None, frozenset())
+
+def _blacklist_norm_set() -> frozenset:
+    """Dosya değişmedikçe normalize edilmiş seti yeniden kurmaz."""
+    global _blacklist_norm_cache
+    bl = _load_blacklist()
+    src, norm = _blacklist_norm_cache
+    if src is not bl:
+        norm = frozenset(_norm(x) for x in bl.get("profiles", []) + bl.get("links", []))
+        _blacklist_norm_cache = (bl, norm)
+    return norm
 
 def _is_blocked(target: str) -> bool:
     if not target:
         return False
-    bl = _load_blacklist()
-    t = _norm(target)
-    profs = [_norm(x) for x in bl.get("profiles", [])]
-    links  = [_norm(x) for x in bl.get("links", [])]
-    return t in profs or t in links
+    return _norm(target) in _blacklist_norm_set()
 
 def _recaptcha_verify(token: str, remote_ip: str) -> bool:
     if not (RECAPTCHA_SECRET and token):
         return False
     try:
-        r = requests.post(
+        r = _http.post(
             "https://www.google.com/recaptcha/api/siteverify",
             data={"secret": RECAPTCHA_SECRET, "response": token, "remoteip": remote_ip},
             timeout=10
@@ -469,41 +483,82 @@ def captcha_verify():
 # --------------------------------------------------------------------------- #
 def block_session(sessionid, duration_sec=1800):
     now = time.time()
-    blocked_until = now + duration_sec
-    entry = {"sessionid": sessionid, "blocked_until": blocked_until}
-    lst = []
-    if os.path.exists(BLOCKED_COOKIES_PATH):
-        with open(BLOCKED_COOKIES_PATH, encoding="utf-8") as f:
-            try:
-                lst = json.load(f)
-            except:
-                lst = []
-    lst = [b for b in lst if b.get("blocked_until", 0) > now]
-    if sessionid not in [b.get("sessionid") for b in lst]:
-        lst.append(entry)
-    with open(BLOCKED_COOKIES_PATH, "w", encoding="utf-8") as f:
-        json.dump(lst, f, indent=2)
+    try:
+        current = _read_json_cached(BLOCKED_COOKIES_PATH, default=[])
+    except Exception:
+        current = []
+    lst = [b for b in current if b.get("blocked_until", 0) > now]
+    already = any(b.get("sessionid") == sessionid for b in lst)
+    if already and len(lst) == len(current):
+        return  # zaten bloklu, düşen kayıt yok → yazmaya gerek yok
+    if not already:
+        lst.append({"sessionid": sessionid, "blocked_until": now + duration_sec})
+    json_io.write_json(BLOCKED_COOKIES_PATH, lst, fsync=True)
+
+# JSON dosya önbelleği: path -> ((mtime_ns, size), parse edilmiş veri)
+_json_file_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+def _read_json_cached(path: str, default=None):
+    """
+    Dosya değişmedikçe (mtime_ns + size) tekrar parse etmez, aynı nesneyi döndürür.
+    Dönen nesne paylaşımlıdır: çağıran DEĞİŞTİRMEMELİ.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return default
+    sig = (st.st_mtime_ns, st.st_size)
+    hit = _json_file_cache.get(path)
+    if hit and hit[0] == sig:
+        return hit[1]
+    with open(path, "rb") as f:
+        data = json_io.loads(f.read())
+    _json_file_cache[path] = (sig, data)
+    return data
+
+def _active_blocked_ids() -> set:
+    """Süresi dolmamış bloklu sessionid'ler."""
+    now = time.time()
+    return {
+        entry.get("sessionid")
+        for entry in _read_json_cached(BLOCKED_COOKIES_PATH, default=[])
+        if entry.get("blocked_until", 0) > now
+    }
+
+def _is_pool_eligible(s: dict) -> bool:
+    """Aktif ve session_key'li mi (blok kontrolü ayrıca, çağrı başına yapılır)."""
+    return (
+        s.get("status", "active") == "active"
+        and s.get("session_key") is not None
+    )
+
+# (kaynak sessions listesi, aktif + session_key'li ve sıralı aday listesi)
+_sorted_candidates_cache: Tuple[Optional[list], list] = (None, [])
+
+def _sorted_candidates() -> list:
+    """
+    Blok durumundan bağımsız filtre + sıralama, sessions.json değişmedikçe
+    bir kez yapılır; çağrı başına yalnızca blok kontrolü kalır.
+    """
+    global _sorted_candidates_cache
+    sessions = _read_json_cached(SESSIONS_PATH)
+    if sessions is None:
+        return []
+    src, cands = _sorted_candidates_cache
+    if src is not sessions:
+        cands = [s for s in sessions if _is_pool_eligible(s)]
+        cands.sort(key=lambda s: int(s["session_key"]))
+        _sorted_candidates_cache = (sessions, cands)
+    return cands
 
 def _cookie_pool():
-    if not os.path.exists(SESSIONS_PATH):
+    cands = _sorted_candidates()
+    if not cands:
         return []
-    with open(SESSIONS_PATH, encoding="utf-8") as f:
-        sessions = json.load(f)
-    blocked_ids = set()
-    now = time.time()
-    if os.path.exists(BLOCKED_COOKIES_PATH):
-        with open(BLOCKED_COOKIES_PATH, encoding="utf-8") as f:
-            for entry in json.load(f):
-                if entry.get("blocked_until", 0) > now:
-                    blocked_ids.add(entry.get("sessionid"))
-    pool = [
-        s for s in sessions
-        if s.get("status", "active") == "active"
-        and s.get("sessionid") not in blocked_ids
-        and s.get("session_key") is not None
-    ]
-    pool.sort(key=lambda s: int(s["session_key"]))
-    return pool
+    blocked_ids = _active_blocked_ids()
+    if not blocked_ids:
+        return list(cands)
+    return [s for s in cands if s.get("sessionid") not in blocked_ids]
 
 def get_next_session():
     pool = _cookie_pool()
@@ -521,18 +576,26 @@ def get_next_session():
         f.write(str(idx))
     return pool[idx]
 
+# UA havuzu: tek bir UA’a saplanma → küçük varyasyonlar (metinler bir kez üretilir)
+_UA_DESKTOP = tuple(
+    f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    f"(KHTML, like Gecko) Chrome/{b} Safari/537.36"
+    for b in ("124.0", "125.0", "126.0", "127.0")
+)
+_UA_MOBILE = tuple(
+    f"Instagram {b} Android"
+    for b in ("296.0.0.0.0", "297.0.0.0.0", "298.0.0.0.0")
+)
+
 def _build_headers(extra: Optional[Dict[str, str]] = None, html: bool=False) -> Dict[str, str]:
-    # UA havuzu: tek bir UA’a saplanma → küçük varyasyonlar
-    chrome_builds = ["124.0", "125.0", "126.0", "127.0"]
-    ua_desktop = (
-        f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-        f"(KHTML, like Gecko) Chrome/{chrome_builds[int(time.time()) % len(chrome_builds)]} Safari/537.36"
-    )
-    ig_android_builds = ["296.0.0.0.0", "297.0.0.0.0", "298.0.0.0.0"]
-    ua_mobile = f"Instagram {ig_android_builds[int(time.time()/60) % len(ig_android_builds)]} Android"
+    now = time.time()
+    if html:
+        ua = _UA_DESKTOP[int(now) % len(_UA_DESKTOP)]
+    else:
+        ua = _UA_MOBILE[int(now/60) % len(_UA_MOBILE)]
 
     h = {
-        "User-Agent": ua_desktop if html else ua_mobile,
+        "User-Agent": ua,
         "Accept": "*/*",
         "Accept-Language": "en-US,en;q=0.9",
         "Referer": "https://www.instagram.com/"
@@ -548,8 +611,10 @@ def _build_headers(extra: Optional[Dict[str, str]] = None, html: bool=False) ->
         h.update(extra)
     return h
 
+_http = make_http_session()
+
 def _http_get(url: str, cookies: Optional[Dict[str, str]]=None, html: bool=False, timeout: int=12):
-    return requests.get(url, headers=_build_headers(html=html), cookies=cookies or {}, timeout=timeout)
+    return _http.get(url, headers=_build_headers(html=html), cookies=cookies or {}, timeout=timeout)
 
 
 # === Cookie utils: "key1=val1; key2=val2; ..." metnini dict'e çevirir ===
@@ -564,8 +629,7 @@ def _load_sessions_list() -> list:
             return []
 
 def _save_sessions_list(lst: list):
-    with open(SESSIONS_PATH, "w", encoding="utf-8") as f:
-        json.dump(lst, f, indent=2, ensure_ascii=False)
+    json_io.write_json(SESSIONS_PATH, lst, fsync=True)
 
 def _next_session_key(lst: list) -> str:
     # session_key sayısal string; en büyüğün +1’i
@@ -582,14 +646,17 @@ def _next_session_key(lst: list) -> str:
 # --------------------------------------------------------------------------- #
 #  PROFILE Yardımcıları                                                       #
 # --------------------------------------------------------------------------- #
+_PROFILE_URL_RE = re.compile(r"(?:instagram\.com|instagr\.am)/([A-Za-z0-9_.]+)(?:/)?$")
+_USERNAME_RE    = re.compile(r"[A-Za-z0-9_.]{2,30}")
+
 def _parse_username_or_url(s: str) -> Optional[str]:
     if not s:
         return None
     s = s.strip()
-    m = re.search(r"(?:instagram\.com|instagr\.am)/([A-Za-z0-9_.]+)(?:/)?$", s)
+    m = _PROFILE_URL_RE.search(s)
     if m:
         return m.group(1)
-    if re.fullmatch(r"[A-Za-z0-9_.]{2,30}", s):
+    if _USERNAME_RE.fullmatch(s):
         return s
     return None
 
@@ -645,7 +712,7 @@ def _extract_object_from(text: str, key: str) -> Optional[dict]:
             k += 1
         return None
     except Exception as ex:
-        logging.exception(f"_extract_object_from error: {ex}")
+        logging.exception("_extract_object_from error: %s", ex)
         return None
 
 def _profile_html_fallback(username: str):
@@ -724,17 +791,39 @@ def _profile_html_fallback(username: str):
 
         return (profile, posts, reels)
     except Exception as ex:
-        logging.exception(f"_profile_html_fallback error for {username}: {ex}")
+        logging.exception("_profile_html_fallback error for %s: %s", username, ex)
         return None, [], []
 
+# username (küçük harf) -> (zaman, uid); kullanıcı id'si sabit, yalnızca başarılı sonuçlar tutulur
+_UID_TTL_SEC = 24 * 3600
+_UID_CACHE_MAX = 5000
+_uid_cache: Dict[str, Tuple[float, str]] = {}
+# istek thread'leri ortak; ağ çağrısı kilit dışında yapılır
+_uid_cache_lock = threading.Lock()
+
 def _get_uid(username: str) -> Optional[str]:
+    key = (username or "").lower()
+    with _uid_cache_lock:
+        hit = _uid_cache.get(key)
+    if hit and time.time() - hit[0] < _UID_TTL_SEC:
+        return hit[1]
+    uid = _fetch_uid(username)
+    if uid:
+        with _uid_cache_lock:
+            _uid_cache.pop(key, None)  # yenilenen kayıt sona geçsin (ilk tahliye edilmesin)
+            if len(_uid_cache) >= _UID_CACHE_MAX:
+                _uid_cache.pop(next(iter(_uid_cache)), None)  # en eski kayıt
+            _uid_cache[key] = (time.time(), uid)
+    return uid
+
+def _fetch_uid(username: str) -> Optional[str]:
     url = f"https://i.instagram.com/api/v1/users/web_profile_info/?username={username}"
     for s in _cookie_pool():
         ck = {k: s.get(k, "") for k in ("sessionid", "ds_user_id", "csrftoken")}
         try:
-            r = requests.get(url, headers=_build_headers(), cookies=ck, timeout=10)
+            r = _http.get(url, headers=_build_headers(), cookies=ck, timeout=10)
             if r.status_code == 200 and "user" in r.text:
-                return r.json()["data"]["user"]["id"]
+                return _resp_json(r)["data"]["user"]["id"]
         except Exception:
             continue
     try:
@@ -845,12 +934,28 @@ def _pf_get(username: str, kind: str):
 def _pf_set(username: str, kind: str, data: dict):
     session[_pf_key(username, kind)] = data
 
+# session_key -> aday session listesi (havuz sırasıyla); aday listesi değiştikçe yeniden kurulur
+_sessions_by_key_cache: Tuple[Any, Dict[Any, List[dict]]] = (None, {})
+
+def _sessions_by_key() -> Dict[Any, List[dict]]:
+    global _sessions_by_key_cache
+    cands = _sorted_candidates()
+    src, idx = _sessions_by_key_cache
+    if src is not cands:
+        idx = {}
+        for s in cands:
+            idx.setdefault(s.get("session_key"), []).append(s)
+        _sessions_by_key_cache = (cands, idx)
+    return idx
+
 def _find_session_by_key(sk: str):
     if not sk: return None
-    for s in _cookie_pool():
-        if s.get("session_key") == sk:
-            return s
-    return None
+    rows = _sessions_by_key().get(sk)
+    if not rows:
+        return None
+    # aynı anahtarlı kayıtlardan bloklu olmayan ilki (eski havuz taramasıyla aynı sonuç)
+    blocked_ids = _active_blocked_ids()
+    return next((s for s in rows if s.get("sessionid") not in blocked_ids), None)
 def _set_used_session(sess_obj: dict):
     """Kullanılan session bilgilerini Flask session'a yazar (log için)."""
     try:
@@ -872,6 +977,22 @@ def _cooldown_for(code: int, soft_n: int) -> int:
         step = 600   # +10 dk
     return min(base + (soft_n-1)*step, 3600)  # max 60 dk
 
+def _resp_json(r):
+    """Yanıt gövdesini orjson (varsa) ile parse eder; geçersiz JSON'da ValueError."""
+    return json_io.loads(r.content)
+
+def _retry_after_sec(r) -> Optional[int]:
+    """Retry-After başlığını saniyeye çevirir (sayı ya da HTTP tarihi); yoksa None."""
+    val = (r.headers.get("Retry-After") or "").strip()
+    if not val:
+        return None
+    if val.isdigit():
+        return int(val)
+    try:
+        return max(0, int(parsedate_to_datetime(val).timestamp() - time.time()))
+    except Exception:
+        return None
+
 # >>> NEW: Private API JSON GET + user feed & reels fetchers
 # --- URL tabanlı JSON GET (cookie ile) --- #
 def _api_json(url: str, s: dict, extra_headers: Optional[Dict[str, str]] = None, timeout: int = 12):
@@ -894,12 +1015,12 @@ def _api_json(url: str, s: dict, extra_headers: Optional[Dict[str, str]] = None,
 
     code = None
     try:
-        r = requests.get(url, headers=headers, cookies=ck, timeout=timeout)
+        r = _http.get(url, headers=headers, cookies=ck, timeout=timeout)
         code = r.status_code
         if code == 200:
             _clear_soft_fail(ck["sessionid"])
             try:
-                return r.json()
+                return _resp_json(r)
             except Exception:
                 return None
 
@@ -907,15 +1028,20 @@ def _api_json(url: str, s: dict, extra_headers: Optional[Dict[str, str]] = None,
         if code in (401, 403, 429):
             n = _bump_soft_fail(ck["sessionid"])
             cool = _cooldown_for(code, n)
+            if code == 429:
+                # IG'nin bildirdiği bekleme süresi alt sınır olur (yine max 60 dk)
+                ra = _retry_after_sec(r)
+                if ra:
+                    cool = max(cool, min(ra, 3600))
             try:
                 block_session(ck["sessionid"], duration_sec=cool)
             except Exception:
                 pass
-            app.logger.error(f"_api_json AUTH/RATE {code} user={s.get('user')} n={n} cool={cool}s url={url[:80]}")
+            app.logger.error("_api_json AUTH/RATE %s user=%s n=%s cool=%ss url=%s", code, s.get('user'), n, cool, url[:80])
             return None
 
         # Diğer non-200
-        app.logger.warning(f"_api_json non-200 {code} url={url}")
+        app.logger.warning("_api_json non-200 %s url=%s", code, url)
         return None
 
     except requests.Timeout:
@@ -926,11 +1052,11 @@ def _api_json(url: str, s: dict, extra_headers: Optional[Dict[str, str]] = None,
             block_session(ck["sessionid"], duration_sec=cool)
         except Exception:
             pass
-        app.logger.warning(f"_api_json timeout user={s.get('user')} cool={cool}s url={url[:80]}")
+        app.logger.warning("_api_json timeout user=%s cool=%ss url=%s", s.get('user'), cool, url[:80])
         return None
 
     except Exception as e:
-        app.logger.error(f"_api_json exception: {e}")
+        app.logger.error("_api_json exception: %s", e)
         return None
 
 # ==== PAGED HELPERS (single page fetchers) ==================================
@@ -1265,9 +1391,9 @@ def _get_stories(uid: str):
 
         for url in endpoints:
             try:
-                r = requests.get(url, headers=headers, cookies=ck, timeout=10)
+                r = _http.get(url, headers=headers, cookies=ck, timeout=10)
                 if r.status_code == 200:
-                    j = r.json()
+                    j = _resp_json(r)
                     items = []
                     if "reels_media" in j:
                         rm = (j.get("reels_media") or [])
@@ -1316,16 +1442,17 @@ def _get_stories(uid: str):
                     if r.status_code in (401, 403):
                         block_session(ck["sessionid"])
                         app.logger.error(
-                            f"Story session AUTH blocked: {s.get('user')} ({ck.get('sessionid')}) - Status: {r.status_code}"
+                            "Story session AUTH blocked: %s (%s) - Status: %s",
+                            s.get('user'), ck.get('sessionid'), r.status_code
                         )
                     else:
                         app.logger.warning(
-                            f"Story session non-200: {s.get('user')} - Status: {r.status_code}"
+                            "Story session non-200: %s - Status: %s", s.get('user'), r.status_code
                         )
 
             except Exception as e:
                 app.logger.error(
-                    f"Story session exception: {s.get('user')} ({ck.get('sessionid')}) - {str(e)}"
+                    "Story session exception: %s (%s) - %s", s.get('user'), ck.get('sessionid'), e
                 )
 
     try:
@@ -1376,9 +1503,9 @@ def _get_highlights(uid: str):
             "csrftoken":  s.get("csrftoken", "")
         }
         try:
-            r = requests.get(tray_url, headers=_build_headers(), cookies=ck, timeout=10)
+            r = _http.get(tray_url, headers=_build_headers(), cookies=ck, timeout=10)
             if r.status_code == 200 and "tray" in r.text:
-                tray = (r.json().get("tray") or [])[:12]
+                tray = (_resp_json(r).get("tray") or [])[:12]
                 used_session_key = s.get("session_key")
                 for t in tray:
                     hid = t.get("id") or t.get("reel_id")
@@ -1386,9 +1513,9 @@ def _get_highlights(uid: str):
                         continue
                     rm_url = f"https://i.instagram.com/api/v1/feed/reels_media/?reel_ids=highlight:{hid}"
                     try:
-                        rr = requests.get(rm_url, headers=_build_headers(), cookies=ck, timeout=10)
+                        rr = _http.get(rm_url, headers=_build_headers(), cookies=ck, timeout=10)
                         if rr.status_code == 200:
-                            j = rr.json()
+                            j = _resp_json(rr)
                             reels_media = (j.get("reels_media") or [])
                             if not reels_media:
                                 continue
@@ -1436,7 +1563,7 @@ def test_sessions():
     for s in sessions:
         ck = {k: s.get(k,"") for k in ("sessionid","ds_user_id","csrftoken")}
         try:
-            r = requests.get("https://i.instagram.com/api/v1/accounts/current_user/", cookies=ck, timeout=10)
+            r = _http.get("https://i.instagram.com/api/v1/accounts/current_user/", cookies=ck, timeout=10)
             print(f"{s.get('user')}: {r.status_code}")
         except Exception as e:
             print(f"{s.get('user')}: ERROR {e}")
@@ -1444,11 +1571,15 @@ def test_sessions():
 # --------------------------------------------------------------------------- #
 #  STANDART MEDYA (reel / video / fotoğraf / igtv)                            #
 # --------------------------------------------------------------------------- #
+_SHORTCODE_RE   = re.compile(r"/(reel|p|tv)/([A-Za-z0-9_-]{5,})")
+_INSTAGR_AM_RE  = re.compile(r"https?://(?:www\.)?instagr\.am")
+_TITLE_UNSAFE_RE = re.compile(r'[^a-zA-Z0-9_\-]')
+
 def _extract_sc(url: str):
-    m = re.search(r"/(reel|p|tv)/([A-Za-z0-9_-]{5,})", url)
+    m = _SHORTCODE_RE.search(url)
     if not m:
-        path = re.sub(r"https?://(?:www\.)?instagr\.am", "", url)
-        m = re.search(r"/(reel|p|tv)/([A-Za-z0-9_-]{5,})", path)
+        path = _INSTAGR_AM_RE.sub("", url)
+        m = _SHORTCODE_RE.search(path)
     return m.group(2) if m else None
 
 def _gql_url(sc: str):
@@ -1500,7 +1631,7 @@ def _process_media(j: dict):
         (info.get("edge_media_to_caption",{}).get("edges") or [{}])[0]
         .get("node",{}).get("text","")
     ) or info.get("owner",{}).get("username") or "instagram"
-    title = re.sub(r'[^a-zA-Z0-9_\-]', '_', raw_title)[:50]
+    title = _TITLE_UNSAFE_RE.sub('_', raw_title)[:50]
     session["video_title"] = title
 
     comments = [
@@ -1540,7 +1671,7 @@ def _fetch_media(gql: str):
             "csrftoken":  s.get("csrftoken", "")
         }
         try:
-            r = requests.get(gql, headers=_build_headers(), cookies=ck, timeout=10)
+            r = _http.get(gql, headers=_build_headers(), cookies=ck, timeout=10)
             txt = r.text or ""
             if r.status_code == 200 and ("shortcode_media" in txt or "xdt_shortcode_media" in txt):
                 try:
@@ -1548,20 +1679,21 @@ def _fetch_media(gql: str):
                         f.write(s.get("session_key", ""))
                 except Exception:
                     pass
-                return r.json(), s
+                return _resp_json(r), s
             else:
                 if r.status_code in (401, 403):
                     block_session(ck["sessionid"])
                     app.logger.error(
-                        f"Media session AUTH blocked: {s.get('user')} ({ck.get('sessionid')}) - Status: {r.status_code}"
+                        "Media session AUTH blocked: %s (%s) - Status: %s",
+                        s.get('user'), ck.get('sessionid'), r.status_code
                     )
                 else:
                     app.logger.warning(
-                        f"Media session non-200: {s.get('user')} - Status: {r.status_code}"
+                        "Media session non-200: %s - Status: %s", s.get('user'), r.status_code
                     )
         except Exception as e:
             app.logger.error(
-                f"Media session exception: {s.get('user')} ({ck.get('sessionid')}) - {str(e)}"
+                "Media session exception: %s (%s) - %s", s.get('user'), ck.get('sessionid'), e
             )
 
     if pool:
@@ -1923,7 +2055,7 @@ def photo_dl(i):
     try:
         imgs = session.get("image_urls", [])
         if 0 <= i < len(imgs):
-            rqs = requests.get(
+            rqs = _http.get(
                 imgs[i],
                 headers={
                     "User-Agent": "Mozilla/5.0",
@@ -1968,7 +2100,7 @@ def photo_dl(i):
             resp.headers["Cache-Control"] = "no-transform, private, max-age=0"
             return resp
     except Exception:
-        app.logger.exception(f"Error in photo_dl index={i}")
+        app.logger.exception("Error in photo_dl index=%s", i)
         sessionid = session.get("sessionid", "")
         if sessionid:
             update_session_counters(sessionid, "fail")
@@ -1987,7 +2119,7 @@ def direct_dl():
             return render_template("download.html",
                                    error=_("Video URL not found."),
                                    media={"downloads":[], "kind":None, "poster":""})
-        rqs = requests.get(
+        rqs = _http.get(
             url, headers={"User-Agent":"Mozilla/5.0","Referer":"https://www.instagram.com/"},
             stream=True, timeout=10
         )
@@ -2072,7 +2204,7 @@ def proxy_download():
             "Accept": "*/*",
             "Accept-Encoding": "identity",  # <<< BOZULMAYAN BINARY
         }
-        rq = requests.get(url, headers=up_headers, stream=True, timeout=20)
+        rq = _http.get(url, headers=up_headers, stream=True, timeout=20)
         if rq.status_code != 200:
             return f"upstream {rq.status_code}", 502
 
@@ -2094,7 +2226,7 @@ def proxy_download():
             resp.headers["Content-Length"] = rq.headers["Content-Length"]
         return resp
     except Exception as e:
-        app.logger.exception(f"proxy_download error: {e}")
+        app.logger.exception("proxy_download error: %s", e)
         return "download error", 500
 
 # --- IMG PROXY (SSRF-hardened & robust) ---
@@ -2147,7 +2279,7 @@ def _safe_get_follow_redirects(url: str, headers: dict, timeout: int, max_hops:
             return None, ("private ip blocked", 400)
 
         try:
-            r = requests.get(cur, headers=headers, timeout=timeout, stream=True, allow_redirects=False)
+            r = _http.get(cur, headers=headers, timeout=timeout, stream=True, allow_redirects=False)
         except Exception as e:
             return None, (f"upstream error: {e}", 502)
 
@@ -2211,7 +2343,7 @@ def img_pxy():
     r, err = _safe_get_follow_redirects(u, headers=headers, timeout=10, max_hops=3)
     if err:
         msg, code = err
-        app.logger.warning(f"img_proxy reject: {u} -> {msg}")
+        app.logger.warning("img_proxy reject: %s -> %s", u, msg)
         return msg, code
 
     if r.status_code != 200:
@@ -2250,7 +2382,7 @@ def img_pxy():
     except Exception as e:
         try: r.close()
         except: pass
-        app.logger.error(f"img_proxy read error for {u}: {e}")
+        app.logger.error("img_proxy read error for %s: %s", u, e)
         return "upstream read error", 502
     finally:
         try: r.close()
@@ -2586,7 +2718,7 @@ def story_download(i):
 
         ext = "mp4" if story.get("type") == "video" else "jpg"
 
-        rqs = requests.get(
+        rqs = _http.get(
             media_url,
             headers={
                 "User-Agent": "Mozilla/5.0",
@@ -2633,7 +2765,7 @@ def story_download(i):
         )
 
     except Exception as e:
-        app.logger.error(f"Story download error: {e}")
+        app.logger.error("Story download error: %s", e)
         # İsteğe bağlı: sayaçları fail olarak güncelle
         try:
             sessionid = session.get("sessionid", "")
@@ -2687,7 +2819,7 @@ def api_sign():
 
         return jsonify({"ok": True, "url": signed})
     except Exception as e:
-        app.logger.error(f"/api/sign error: {e}")
+        app.logger.error("/api/sign error: %s", e)
         return jsonify({"ok": False, "err": "server"}), 500
 
 # ---- Date range helper (YYYY-MM-DD -> epoch) --------------------------------
@@ -2818,9 +2950,9 @@ def api_user_reels(username):
         h  = _build_headers({"X-CSRFToken": ck["csrftoken"]})
         if extra_headers: h.update(extra_headers)
         try:
-            r = requests.get(url, headers=h, cookies=ck, timeout=12)
+            r = _http.get(url, headers=h, cookies=ck, timeout=12)
             if r.status_code == 200:
-                return r.json(), s, url
+                return _resp_json(r), s, url
         except Exception:
             pass
         return None, None, url
@@ -3071,9 +3203,9 @@ def api_hl_items(username, hid):
         }
         h = _build_headers({"X-CSRFToken": ck["csrftoken"]})
         try:
-            r = requests.get(url, headers=h, cookies=ck, timeout=10)
+            r = _http.get(url, headers=h, cookies=ck, timeout=10)
             if r.status_code == 200:
-                return r.json()
+                return _resp_json(r)
         except Exception:
             pass
         return None
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+# Ortak HTTP oturumu kurucusu (app.py ve session_pool aynı ayarları kullanır).
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def make_http_session(pool_connections: int = 16, pool_maxsize: int = 32) -> requests.Session:
+    """
+    Keep-alive + bağlantı havuzlu HTTP oturumu: her istekte TCP/TLS el
+    sıkışması tekrarlanmaz. Çerezler her çağrıda açıkça verilir; jar'a hiçbir
+    şey yazılmaz ki hesapların çerezleri birbirine karışmasın.
+    """
+    s = requests.Session()
+    s.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize, max_retries=0)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# Ortak JSON okuma/yazma yardımcıları.
+# orjson kuruluysa onu (C tabanlı, hızlı) kullanır; yoksa stdlib json'a düşer.
+import json
+import os
+import tempfile
+
+try:
+    import orjson  # opsiyonel: varsa C tabanlı hızlı JSON
+except ImportError:
+    orjson = None
+
+
+def loads(raw):
+    """bytes/str JSON metnini parse eder; geçersiz JSON'da ValueError."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps(obj) -> bytes:
+    """
+    indent=2, UTF-8 bayt çıktısı. sessions.json vb. admin panelden elle de
+    okunduğu için girinti korunur.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def read_json(path: str, default=None):
+    """Dosya yoksa default döner; parse hataları çağırana bırakılır."""
+    if not os.path.exists(path):
+        return default
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def write_bytes(path: str, data: bytes, fsync: bool = False) -> None:
+    """
+    Atomik yazma: aynı dizinde benzersiz bir geçici dosyaya yazılır, sonra
+    os.replace. Yarıda kesilen yazma canlı dosyayı bozmaz; eşzamanlı yazarlar
+    (thread/worker) birbirinin geçici dosyasını ezmez. Mevcut dosyanın
+    izinleri korunur. fsync=True ise veri diske indirilmeden yer değiştirilmez.
+    """
+    fd, tmp = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)),
+        prefix=os.path.basename(path) + ".",
+        suffix=".tmp",
+    )
+    try:
+        # mkstemp 0600 açar; mevcut dosyanın izinleri korunur
+        try:
+            os.fchmod(fd, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.fchmod(fd, 0o644)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        if fsync:
+            os.fsync(fd)
+        os.close(fd)
+        fd = -1
+        os.replace(tmp, path)
+    except BaseException:
+        if fd >= 0:
+            os.close(fd)
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_json(path: str, obj, fsync: bool = False) -> None:
+    """obj'yi dumps ile serileştirip write_bytes ile atomik yazar."""
+    write_bytes(path, dumps(obj), fsync)
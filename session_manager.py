@@ -1,28 +1,25 @@
-import json
-import os
 import time
 from datetime import datetime
 
+import json_io
+
 SESSIONS_FILE = "sessions.json"
 BLOCKED_FILE = "blocked_cookies.json"
 
+_MISSING = object()
+
 def load_json(path):
-    if not os.path.exists(path):
-        return []
-    with open(path, "r") as f:
-        return json.load(f)
+    return json_io.read_json(path, default=[])
 
 def save_json(path, data):
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    json_io.write_json(path, data)
 
 def normalize_session(entry):
     # Anahtar uyumsuzluklarını normalize et
-    if "username" in entry:
-        entry["user"] = entry["username"]
-        del entry["username"]
-    if "country" in entry:
-        del entry["country"]
+    u = entry.pop("username", _MISSING)
+    if u is not _MISSING:
+        entry["user"] = u
+    entry.pop("country", None)
     # default alanlar
     entry.setdefault("fail_count", 0)
     entry.setdefault("success_count", 0)
@@ -41,9 +38,10 @@ def _blocked_set_with_expiry() -> set:
         data = load_json(BLOCKED_FILE)
         if isinstance(data, list):
             for row in data:
-                sid = (row or {}).get("sessionid")
-                bu  = float((row or {}).get("blocked_until", 0))
-                if sid and bu > now:
+                if not row:
+                    continue
+                sid = row.get("sessionid")
+                if sid and float(row.get("blocked_until", 0)) > now:
                     out.add(sid)
     except Exception:
         pass
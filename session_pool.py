@@ -1,9 +1,11 @@
 # /var/www/instavido/session_pool.py
 # -*- coding: utf-8 -*-
-import os, json, time, random, threading, logging
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+import os, time, random, threading, logging, atexit
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Tuple
 import requests
+import json_io
+from http_client import make_http_session
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SESSIONS_PATH = os.path.join(BASE_DIR, "sessions.json")
@@ -25,30 +27,90 @@ def _load_jitter() -> tuple[int, int]:
     return (400, 1200)
 
 JITTER_RANGE_MS = _load_jitter()
+# saniye cinsinden alt sınır + aralık: lo + span * random()
+_JITTER_LO_S = JITTER_RANGE_MS[0] / 1000.0
+_JITTER_SPAN_S = (JITTER_RANGE_MS[1] - JITTER_RANGE_MS[0]) / 1000.0
 
 # Karantina süreleri (dk)
 KARANTINA_DK       = 30   # 401/403/419
 KARANTINA_429_DK   = 12   # 429 için daha kısa throttle
 
+# sessions.json / index yazımı: değişiklikler bu aralıkla toplu diske yazılır (sn)
+FLUSH_INTERVAL_S = 2.0
+
+# fingerprint'te alan yoksa kullanılacak varsayılan header değerleri
+DEFAULT_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/123.0.0.0 Safari/537.36"
+)
+DEFAULT_SEC_CH_UA = '"Chromium";v="123", "Google Chrome";v="123", ";Not A Brand";v="99"'
+DEFAULT_ACCEPT_LANG = "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7"
+DEFAULT_REFERER = "https://www.instagram.com/"
+DEFAULT_IG_APP_ID = "1217981644879628"
+DEFAULT_ASBD_ID = "129477"
+
 # requests için default timeout
 REQ_TIMEOUT = (10, 35)  # (connect, read)
 
+# proxy URL -> requests'e verilen {"http": p, "https": p} (oturum dict'ine yazılmaz,
+# sessions.json'a sızmasın diye ayrı tutulur)
+_proxies_cache: Dict[str, dict] = {}
+
 log = logging.getLogger("session_pool")
 log.setLevel(logging.INFO)
 
 
+# (epoch saniyesi, biçimlenmiş metin): aynı saniyede strftime tekrarlanmaz
+_now_str_cache = (0, "")
+
 def _now_str() -> str:
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    global _now_str_cache
+    sec = int(time.time())
+    if _now_str_cache[0] != sec:
+        _now_str_cache = (sec, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec)))
+    return _now_str_cache[1]
 
 
-def _atomic_write(path: str, content: str):
-    tmp = f"{path}.tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        f.write(content)
-    os.replace(tmp, path)
+# blocked_cookies.json önbelleği: ((mtime_ns, size), satırlar, sessionid -> blocked_until)
+_blocked_cache: Tuple[Optional[Tuple[int, int]], List[dict], Dict[str, float]] = (None, [], {})
 
 
-def _read_blocked_list() -> List[dict]:
+def _blocked_snapshot() -> Tuple[List[dict], Dict[str, float]]:
+    """
+    Dosya değişmedikçe (mtime_ns + size) yeniden parse etmez.
+    Dönen liste/dict paylaşımlıdır: çağıran DEĞİŞTİRMEMELİ.
+    """
+    global _blocked_cache
+    try:
+        st = os.stat(BLOCKED_PATH)
+    except OSError:
+        return [], {}
+    sig = (st.st_mtime_ns, st.st_size)
+    if _blocked_cache[0] == sig:
+        return _blocked_cache[1], _blocked_cache[2]
+    rows = _parse_blocked_file()
+    by_sid: Dict[str, float] = {}
+    for r in rows:
+        sid = (r or {}).get("sessionid")
+        if not sid:
+            continue
+        try:
+            bu = float(r.get("blocked_until", 0) or 0)
+        except (TypeError, ValueError):
+            continue
+        if bu > by_sid.get(sid, 0.0):
+            by_sid[sid] = bu
+    _blocked_cache = (sig, rows, by_sid)
+    return rows, by_sid
+
+
+def _blocked_map() -> Dict[str, float]:
+    """sessionid -> blocked_until (epoch); aynı sid birden çoksa en geç olanı."""
+    return _blocked_snapshot()[1]
+
+
+def _parse_blocked_file() -> List[dict]:
     """
     Ortak format (liste):
       [
@@ -57,10 +119,9 @@ def _read_blocked_list() -> List[dict]:
       ]
     Eski dict formatını da otomatik listeye çevirir.
     """
-    if not os.path.exists(BLOCKED_PATH):
-        return []
     try:
-        data = json.loads(open(BLOCKED_PATH, "r", encoding="utf-8").read())
+        with open(BLOCKED_PATH, "rb") as f:
+            data = json_io.loads(f.read())
         if isinstance(data, list):
             return data
         # Eski olası dict formatını listeye göç et (eski uyum)
@@ -83,7 +144,7 @@ def _read_blocked_list() -> List[dict]:
     return []
 
 
-def _write_blocked_list(rows: List[dict]):
+def _write_blocked_list(rows: List[dict], durable: bool = False):
     # Aynı sessionid için tek kayıt bırak; süresi geçenleri at.
     merged = {}
     now = time.time()
@@ -98,7 +159,7 @@ def _write_blocked_list(rows: List[dict]):
         if (not prev) or (float(bu) > float(prev.get("blocked_until", 0))):
             merged[sid] = {"sessionid": sid, "blocked_until": float(bu)}
     out = list(merged.values())
-    _atomic_write(BLOCKED_PATH, json.dumps(out, ensure_ascii=False, indent=2))
+    json_io.write_bytes(BLOCKED_PATH, json_io.dumps(out), durable)
 
 
 class SessionPool:
@@ -119,8 +180,23 @@ class SessionPool:
         self.lock = threading.Lock()
         self.sessions: List[Dict[str, Any]] = []
         self.idx = 0
+        self._idx_saved: Optional[int] = None
+        # sessionid -> karantina bitişi (epoch); "unblock_at" metni yalnızca gösterim için
+        self._unblock_epoch: Dict[str, float] = {}
+        # sessionid -> (kaynak nesne, hazır dict): header/cookie her istekte yeniden kurulmaz
+        self._hdr_cache: Dict[str, tuple] = {}
+        self._ck_cache: Dict[str, tuple] = {}
+        # sessionid -> bu hesapla bir sonraki isteğin en erken zamanı (monotonic)
+        self._next_slot: Dict[str, float] = {}
+        self._dirty = False
+        self._http = make_http_session(pool_connections=32, pool_maxsize=64)
         self._load()
 
+        # kirli state'i arka planda topluca yaz; çıkışta son kez flush
+        t = threading.Thread(target=self._flush_loop, name="session_pool-flush", daemon=True)
+        t.start()
+        atexit.register(self.flush, durable=True)
+
     # ---------- public API ----------
     def http_get(self, url: str, params: Optional[dict] = None,
                  extra_headers: Optional[dict] = None,
@@ -147,9 +223,12 @@ class SessionPool:
     # ---------- iç işler ----------
     def _load(self):
         with self.lock:
+            self._hdr_cache.clear()
+            self._ck_cache.clear()
             if os.path.exists(self.path_sessions):
                 try:
-                    self.sessions = json.loads(open(self.path_sessions, "r", encoding="utf-8").read())
+                    with open(self.path_sessions, "rb") as f:
+                        self.sessions = json_io.loads(f.read())
                 except Exception:
                     self.sessions = []
             else:
@@ -163,9 +242,10 @@ class SessionPool:
                     self.idx = 0
             else:
                 self.idx = 0
+            self._idx_saved = self.idx
 
-            # BLOK KONTROL (ortak format liste)
-            blocked_list = _read_blocked_list()
+            # BLOK KONTROL (ortak format liste → sid indeksi)
+            blocked = _blocked_map()
             now = time.time()
 
             # normalize alanlar
@@ -185,83 +265,123 @@ class SessionPool:
                 sid = s.get("sessionid")
                 if not sid:
                     continue
-                for b in blocked_list:
-                    if b.get("sessionid") == sid and float(b.get("blocked_until", 0)) > now:
-                        s["blocked"] = True
-                        # içeriye insan okunur da yazalım
-                        s["unblock_at"] = datetime.fromtimestamp(float(b["blocked_until"])).strftime("%Y-%m-%d %H:%M:%S")
-                        break
-
-    def _save(self):
+                bu = blocked.get(sid, 0.0)
+                if bu > now:
+                    s["blocked"] = True
+                    self._unblock_epoch[sid] = bu
+                    # içeriye insan okunur da yazalım
+                    s["unblock_at"] = datetime.fromtimestamp(bu).strftime("%Y-%m-%d %H:%M:%S")
+
+    def flush(self, durable: bool = False):
+        """Bekleyen değişiklik varsa diske yazar."""
         with self.lock:
-            _atomic_write(self.path_sessions, json.dumps(self.sessions, ensure_ascii=False, indent=2))
-            _atomic_write(self.path_idx, str(self.idx))
+            if self._dirty:
+                self._save_locked(durable)
 
-            # blocked_cookies.json’u ORTAK liste formatında güncelle
-            now = time.time()
-            existing = _read_blocked_list()  # mevcutları al, süresi geçmişleri _write temizliyor zaten
-            extra = []
-            for s in self.sessions:
-                if s.get("blocked"):
-                    # iç veri 'unblock_at' string olabilir → epoch’a çevir
-                    ts = None
-                    if s.get("unblock_at"):
-                        try:
-                            dt = datetime.strptime(s["unblock_at"], "%Y-%m-%d %H:%M:%S")
-                            ts = time.mktime(dt.timetuple())
-                        except Exception:
-                            ts = None
-                    if not ts:
-                        # karantina varsayılan süresi kadar
-                        ts = now + KARANTINA_DK * 60
-                    extra.append({"sessionid": s.get("sessionid"), "blocked_until": float(ts)})
-
-            _write_blocked_list(existing + extra)
-
-    def _sleep_jitter(self):
-        t_ms = random.randint(*JITTER_RANGE_MS)
-        time.sleep(t_ms / 1000.0)
+    def _flush_loop(self):
+        while True:
+            time.sleep(FLUSH_INTERVAL_S)
+            try:
+                self.flush()
+            except Exception:
+                log.exception("SessionPool flush hatası")
+
+    def _save_locked(self, durable: bool = False):
+        # self.lock tutulurken çağrılır
+        # blocked_cookies.json’a eklenecek karantinalar (sessions.json'dan önce:
+        # süresi geçen bayraklar burada temizlenip aynı yazımda diske insin)
+        now = time.time()
+        extra = []
+        for s in self.sessions:
+            sid = s.get("sessionid")
+            if not (s.get("blocked") and sid):
+                continue
+            ts = self._unblock_epoch.get(sid)
+            if not ts:
+                # epoch bilinmiyorsa (eski kayıt) 'unblock_at' metninden çevir
+                ts = None
+                if s.get("unblock_at"):
+                    try:
+                        dt = datetime.strptime(s["unblock_at"], "%Y-%m-%d %H:%M:%S")
+                        ts = time.mktime(dt.timetuple())
+                    except Exception:
+                        ts = None
+                if not ts:
+                    # karantina varsayılan süresi kadar (bir kez hesaplanır, kaymasın)
+                    ts = now + KARANTINA_DK * 60
+                    s["unblock_at"] = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+                self._unblock_epoch[sid] = ts
+            if ts <= now:
+                # süresi dolmuş → bayrağı temizle, dosyaya yazma
+                s["blocked"] = False
+                s["unblock_at"] = None
+                self._unblock_epoch.pop(sid, None)
+                continue
+            extra.append({"sessionid": sid, "blocked_until": float(ts)})
+
+        self._dirty = False
+        json_io.write_bytes(self.path_sessions, json_io.dumps(self.sessions), durable)
+        if self.idx != self._idx_saved:
+            json_io.write_bytes(self.path_idx, str(self.idx).encode("ascii"), durable)
+            self._idx_saved = self.idx
+
+        # blocked_cookies.json’u ORTAK liste formatında güncelle
+        existing, current = _blocked_snapshot()  # önbellekten; süresi geçmişleri _write temizliyor
+        # Dosya zaten güncelse (düşecek/tekrarlı kayıt yok, bitişler aynı ya da daha geç) yazma
+        stale = len(existing) != len(current) or any(bu <= now for bu in current.values())
+        if stale or any(current.get(r["sessionid"], 0.0) < r["blocked_until"] for r in extra):
+            _write_blocked_list(existing + extra, durable)
+
+    def _sleep_jitter(self, s: Dict[str, Any]):
+        # Aynı hesabın ardışık istekleri arasında en az jitter kadar boşluk;
+        # hesap bir süredir kullanılmadıysa hiç beklenmez.
+        sid = s.get("sessionid") or ""
+        gap = _JITTER_LO_S + _JITTER_SPAN_S * random.random()
+        now = time.monotonic()
+        with self.lock:
+            start = max(now, self._next_slot.get(sid, 0.0))
+            self._next_slot[sid] = start + gap
+        if start > now:
+            time.sleep(start - now)
 
     def _pick_session(self) -> Optional[Dict[str, Any]]:
+        # dosya stat/parse kilit dışında; kilit yalnızca bellek içi seçim için tutulur
+        blocked = _blocked_map()
+        now = time.time()
         with self.lock:
             if not self.sessions:
                 return None
 
             N = len(self.sessions)
             start = self.idx % N
-            now = time.time()
-            blocked_list = _read_blocked_list()
 
             for offset in range(N):
                 i = (start + offset) % N
                 s = self.sessions[i]
 
-                # Karantinayı kontrol et (dosya hakikati → state’i senkronla)
+                # Karantinayı kontrol et (dosya + bellek; snapshot kilit dışında
+                # alındığından arada başka thread'in koyduğu karantina kaybolmasın)
                 sid = s.get("sessionid")
-                is_blocked = False
-                unblock_epoch = None
-                for b in blocked_list:
-                    if b.get("sessionid") == sid:
-                        unblock_epoch = float(b.get("blocked_until", 0))
-                        if unblock_epoch > now:
-                            is_blocked = True
-                        break
-
-                if is_blocked:
-                    # içeride de işaretli tut
+                unblock_epoch = max(blocked.get(sid, 0.0), self._unblock_epoch.get(sid, 0.0))
+
+                if unblock_epoch > now:
+                    # içeride de işaretli tut (metni yalnızca bitiş değiştiyse yeniden üret)
                     s["blocked"] = True
-                    s["unblock_at"] = datetime.fromtimestamp(unblock_epoch).strftime("%Y-%m-%d %H:%M:%S")
+                    if self._unblock_epoch.get(sid) != unblock_epoch:
+                        self._unblock_epoch[sid] = unblock_epoch
+                        s["unblock_at"] = datetime.fromtimestamp(unblock_epoch).strftime("%Y-%m-%d %H:%M:%S")
                     continue
                 else:
                     # süresi dolmuşsa bayrakları temizle
                     if s.get("blocked"):
                         s["blocked"] = False
                         s["unblock_at"] = None
+                        self._unblock_epoch.pop(sid, None)
 
                 # aktif/uygun session
                 self.idx = i + 1
                 s["last_used"] = _now_str()
-                self._save()
+                self._dirty = True
                 return s
 
             return None
@@ -270,7 +390,7 @@ class SessionPool:
         with self.lock:
             s["success_count"] = int(s.get("success_count", 0)) + 1
             s["status"] = "active"
-            self._save()
+            self._dirty = True
 
     def _report_failure(self, s: Dict[str, Any], *, status_code: Optional[int] = None, block: bool = False):
         with self.lock:
@@ -289,8 +409,9 @@ class SessionPool:
 
             if block_minutes:
                 s["blocked"] = True
-                unblock_at_dt = datetime.now() + timedelta(minutes=block_minutes)
-                s["unblock_at"] = unblock_at_dt.strftime("%Y-%m-%d %H:%M:%S")
+                unblock_epoch = time.time() + block_minutes * 60
+                self._unblock_epoch[s.get("sessionid")] = unblock_epoch
+                s["unblock_at"] = datetime.fromtimestamp(unblock_epoch).strftime("%Y-%m-%d %H:%M:%S")
 
             # hafif log
             try:
@@ -300,135 +421,128 @@ class SessionPool:
             except Exception:
                 pass
 
-            self._save()
+            if block_minutes:
+                # karantina app.py/admin ile paylaşılıyor → beklemeden yaz
+                self._save_locked()
+            else:
+                self._dirty = True
 
     def _build_headers(self, s: Dict[str, Any], extra: Optional[dict]) -> dict:
-        fp = s.get("fingerprint") or {}
-        ua = fp.get("user_agent") or (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/123.0.0.0 Safari/537.36"
-        )
-        sec_ua = fp.get("sec_ch_ua") or '"Chromium";v="123", "Google Chrome";v="123", ";Not A Brand";v="99"'
-        sec_ua_m = fp.get("sec_ch_ua_mobile") or "?0"
-        sec_plat = fp.get("sec_ch_ua_platform") or '"Windows"'
-        accept_lang = fp.get("accept_language") or "tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7"
-        referer = fp.get("referer") or "https://www.instagram.com/"
-        x_ig_app_id = fp.get("x_ig_app_id") or "1217981644879628"
-        asbd_id = fp.get("x_asbd_id") or "129477"
-
-        headers = {
-            "User-Agent": ua,
+        # fingerprint nesnesi değişmedikçe önceden kurulmuş dict kullanılır
+        fp = s.get("fingerprint")
+        key = s.get("sessionid") or ""
+        hit = self._hdr_cache.get(key)
+        if hit is None or hit[0] is not fp:
+            hit = self._hdr_cache[key] = (fp, self._headers_from_fp(fp or {}))
+        if extra:
+            return {**hit[1], **extra}
+        return hit[1]
+
+    @staticmethod
+    def _headers_from_fp(fp: dict) -> dict:
+        return {
+            "User-Agent": fp.get("user_agent") or DEFAULT_UA,
             "Accept": "*/*",
-            "Accept-Language": accept_lang,
-            "Referer": referer,
+            "Accept-Language": fp.get("accept_language") or DEFAULT_ACCEPT_LANG,
+            "Referer": fp.get("referer") or DEFAULT_REFERER,
             "Sec-Fetch-Site": "same-origin",
             "Sec-Fetch-Mode": "cors",
             "Sec-Fetch-Dest": "empty",
-            "sec-ch-ua": sec_ua,
-            "sec-ch-ua-mobile": sec_ua_m,
-            "sec-ch-ua-platform": sec_plat,
-            "X-IG-App-ID": x_ig_app_id,
-            "X-ASBD-ID": asbd_id,
+            "sec-ch-ua": fp.get("sec_ch_ua") or DEFAULT_SEC_CH_UA,
+            "sec-ch-ua-mobile": fp.get("sec_ch_ua_mobile") or "?0",
+            "sec-ch-ua-platform": fp.get("sec_ch_ua_platform") or '"Windows"',
+            "X-IG-App-ID": fp.get("x_ig_app_id") or DEFAULT_IG_APP_ID,
+            "X-ASBD-ID": fp.get("x_asbd_id") or DEFAULT_ASBD_ID,
         }
-        if extra:
-            headers.update(extra)
-        return headers
 
     def _build_cookies(self, s: Dict[str, Any]) -> dict:
         # Geniş cookie setini destekle, yoksa eski alanlardan derle
-        ck = dict(s.get("cookies") or {})
+        src = s.get("cookies")
+        legacy = (s.get("sessionid"), s.get("ds_user_id"), s.get("csrftoken"))
+        key = legacy[0] or ""
+        hit = self._ck_cache.get(key)
+        if hit is not None and hit[0] is src and hit[1] == legacy:
+            return hit[2]
+        ck = dict(src or {})
         # geriye dönük uyumluluk
-        for k in ("sessionid", "ds_user_id", "csrftoken"):
-            if s.get(k) and k not in ck:
-                ck[k] = s[k]
+        for k, v in zip(("sessionid", "ds_user_id", "csrftoken"), legacy):
+            if v and k not in ck:
+                ck[k] = v
+        self._ck_cache[key] = (src, legacy, ck)
         return ck
 
     def _build_proxies(self, s: Dict[str, Any]) -> Optional[dict]:
         p = s.get("proxy")
         if not p:
             return None
-        return {"http": p, "https": p}
+        # proxy metni nadiren değişir → aynı dict'i yeniden kullan
+        px = _proxies_cache.get(p)
+        if px is None:
+            px = _proxies_cache[p] = {"http": p, "https": p}
+        return px
+
+    def _send(self, method: str, url: str, s: Dict[str, Any],
+              params: Optional[dict], data: Optional[dict],
+              json_body: Optional[dict], extra_headers: Optional[dict],
+              allow_redirects: bool) -> requests.Response:
+        headers = self._build_headers(s, extra_headers)
+        cookies = self._build_cookies(s)
+        proxies = self._build_proxies(s)
+        if method == "GET":
+            return self._http.get(
+                url, params=params, headers=headers, cookies=cookies,
+                proxies=proxies, timeout=REQ_TIMEOUT, allow_redirects=allow_redirects
+            )
+        return self._http.post(
+            url, params=params, data=data, json=json_body,
+            headers=headers, cookies=cookies, proxies=proxies,
+            timeout=REQ_TIMEOUT, allow_redirects=allow_redirects
+        )
 
     def _http_request(self, method: str, url: str,
                       params: Optional[dict], data: Optional[dict],
                       json_body: Optional[dict] = None,
                       extra_headers: Optional[dict] = None,
                       allow_redirects: bool = True) -> requests.Response:
-        # round-robin ile session seç
-        s = self._pick_session()
-        if not s:
-            raise RuntimeError("SessionPool: kullanılabilir oturum yok.")
-
-        self._sleep_jitter()
-
-        headers = self._build_headers(s, extra_headers)
-        cookies = self._build_cookies(s)
-        proxies = self._build_proxies(s)
-
-        try:
-            if method == "GET":
-                resp = requests.get(
-                    url, params=params, headers=headers, cookies=cookies,
-                    proxies=proxies, timeout=REQ_TIMEOUT, allow_redirects=allow_redirects
-                )
-            else:
-                resp = requests.post(
-                    url, params=params, data=data, json=json_body,
-                    headers=headers, cookies=cookies, proxies=proxies,
-                    timeout=REQ_TIMEOUT, allow_redirects=allow_redirects
-                )
-        except requests.RequestException:
-            self._report_failure(s, status_code=None, block=False)
-            raise
-
-        # Başarı
-        if resp.status_code in (200, 206):
-            self._report_success(s)
-            return resp
-
-        # Rate-limit/oturum sorunları
-        if resp.status_code in (401, 403, 419, 429):
-            # Karantina (status'a göre süre)
-            self._report_failure(s, status_code=resp.status_code, block=True)
-        else:
-            self._report_failure(s, status_code=resp.status_code, block=False)
-
-        # Bir kez daha farklı session ile dene (hızlı fallback)
-        alt = self._pick_session()
-        if not alt:
-            return resp  # yapacak bir şey yok, orijinali dön
-
-        self._sleep_jitter()
-        headers = self._build_headers(alt, extra_headers)
-        cookies = self._build_cookies(alt)
-        proxies = self._build_proxies(alt)
-        try:
-            if method == "GET":
-                r2 = requests.get(
-                    url, params=params, headers=headers, cookies=cookies,
-                    proxies=proxies, timeout=REQ_TIMEOUT, allow_redirects=allow_redirects
-                )
-            else:
-                r2 = requests.post(
-                    url, params=params, data=data, json=json_body,
-                    headers=headers, cookies=cookies, proxies=proxies,
-                    timeout=REQ_TIMEOUT, allow_redirects=allow_redirects
-                )
-        except requests.RequestException:
-            self._report_failure(alt, status_code=None, block=False)
+        # round-robin ile session seç; hata/bağlantı sorununda bir kez farklı session ile dene.
+        # Yalnızca ConnectionError tekrarlanır: zaman aşımı vb. istekte sunucuya ulaşmış
+        # olabilir (özellikle POST), ikinci hesapla yeniden gönderilmez.
+        resp: Optional[requests.Response] = None
+        last_exc: Optional[Exception] = None
+        for attempt in range(2):
+            s = self._pick_session()
+            if not s:
+                if attempt == 0:
+                    raise RuntimeError("SessionPool: kullanılabilir oturum yok.")
+                break  # fallback için oturum yok
+
+            self._sleep_jitter(s)
+            try:
+                r = self._send(method, url, s, params, data, json_body,
+                               extra_headers, allow_redirects)
+            except requests.ConnectionError as e:
+                self._report_failure(s, status_code=None, block=False)
+                last_exc = e
+                continue
+            except requests.RequestException:
+                self._report_failure(s, status_code=None, block=False)
+                if resp is not None:
+                    return resp  # fallback denemesi patladı → ilk yanıtı dön
+                raise
+
+            # Başarı
+            if r.status_code in (200, 206):
+                self._report_success(s)
+                return r
+
+            # Rate-limit/oturum sorunları → karantina (status'a göre süre)
+            self._report_failure(s, status_code=r.status_code,
+                                 block=r.status_code in (401, 403, 419, 429))
+            resp = r
+
+        if resp is not None:
             return resp
-
-        if r2.status_code in (200, 206):
-            self._report_success(alt)
-            return r2
-
-        if r2.status_code in (401, 403, 419, 429):
-            self._report_failure(alt, status_code=r2.status_code, block=True)
-        else:
-            self._report_failure(alt, status_code=r2.status_code, block=False)
-
-        return r2
+        raise last_exc
 
 
 # Global havuz (app.py içinden direkt import edip kullanabilirsiniz)